@@ -3,6 +3,11 @@ from mysql.connector import Error
 import os
 import pandas as pd
 from dotenv import load_dotenv
+from rollups import create_rollup_tables, filter_new_posts, update_rollups
+from body_store import (
+    POST_LIST_COLUMNS, create_body_table, fetch_post_bodies, fill_blanks, insert_bodies,
+    prepare_bodies
+)
 
 
 class DatabaseConnection:
@@ -83,6 +88,7 @@ def create_reddit_table(db):
         author VARCHAR(255) NOT NULL,
         title TEXT NOT NULL,
         text LONGTEXT,
+        body_hash CHAR(64),
         url TEXT,
         created_utc TIMESTAMP,
         score INT DEFAULT 0,
@@ -116,6 +122,9 @@ def create_reddit_table(db):
                     print(f"Error creating index: {e}")
                 
         print("Indexes created successfully!")
+
+        create_rollup_tables(db)
+        create_body_table(db)
         
     except Error as e:
         print(f"Error creating table: {e}")
@@ -144,35 +153,45 @@ def fetch_reddit_data(db_connection, query, params=None):
         return None
 
       
-db_conn = DatabaseConnection()
-try:
-    if db_conn.connect():
-        limit = 20  # Set your desired limit
+if __name__ == "__main__":
+    db_conn = DatabaseConnection()
+    try:
+        if db_conn.connect():
+            limit = 20  # Set your desired limit
 
-        query = "SELECT * FROM reddit_posts LIMIT %s;" # Limit in the query
-        params = (limit,) # Limit passed as a parameter
+            query = f"SELECT {POST_LIST_COLUMNS} FROM reddit_posts LIMIT %s;" # Limit in the query
+            params = (limit,) # Limit passed as a parameter
 
-        all_posts = fetch_reddit_data(db_conn, query, params)
-        if all_posts:
-            print(f"Retrieved {len(all_posts)} posts (limit was {limit}):")
-            for post in all_posts:
-                print(post)
-        else:
-             print("No posts found or an error occurred.") # Handle the case where no posts are found
+            all_posts = fetch_reddit_data(db_conn, query, params)
+            if all_posts:
+                print(f"Retrieved {len(all_posts)} posts (limit was {limit}):")
+                for post in all_posts:
+                    print(post)
+            else:
+                 print("No posts found or an error occurred.") # Handle the case where no posts are found
 
-finally:  # Ensure the connection is closed even if errors occur
-    db_conn.disconnect()
+    finally:  # Ensure the connection is closed even if errors occur
+        db_conn.disconnect()
 
     import pandas as pd
 from mysql.connector import Error
 
 def import_scraped_data_to_db(db, scraped_data):
+    """
+    Insert scraped posts, ignoring ids that are already stored
+
+    Returns:
+        Number of records processed, or None if any batch failed.
+    """
     try:
         df = pd.DataFrame(scraped_data)
 
         if 'created_utc' in df.columns:
             df['created_utc'] = pd.to_datetime(df['created_utc'], unit='s')
 
+        # Bodies go to the compressed, deduplicated side table
+        df, bodies = prepare_bodies(df)
+
         # ---  Changes to prevent duplicates and updates ---
         placeholders = ", ".join(["%s"] * len(df.columns))  # Dynamic placeholders
         columns = ", ".join(df.columns)
@@ -183,23 +202,31 @@ def import_scraped_data_to_db(db, scraped_data):
         """
 
         # Convert DataFrame rows to tuples
-        values = [tuple(row) for row in df.fillna('').to_records(index=False)]
+        values = [tuple(row) for row in fill_blanks(df).to_records(index=False)]
 
+        failed = False
         batch_size = 1000
         for i in range(0, len(values), batch_size):
             batch = values[i:i + batch_size]
             try:
+                # Only rows not already stored count towards the rollups
+                new_posts = filter_new_posts(db.cursor, df.iloc[i:i + batch_size])
+                insert_bodies(db.cursor, bodies, new_posts)
                 db.cursor.executemany(insert_query, batch)
+                update_rollups(db.cursor, new_posts)
                 db.connection.commit()
                 print(f"Inserted/Ignored records {i} to {i + len(batch)}")  # Indicate some might be ignored
             except Error as e:
                 print(f"Error inserting batch: {e}")
                 db.connection.rollback()
+                failed = True
 
         print(f"Data import completed. {len(values)} records processed. Some might have been ignored due to duplicates.")
+        return None if failed else len(values)
 
     except Exception as e:
         print(f"Error during import: {e}")
+        return None
 
 
 def append_data_to_db(db, df):
@@ -209,9 +236,14 @@ def append_data_to_db(db, df):
     Args:
         db: Database connection object
         df: Pandas DataFrame to append
-        table_name: Name of the table to append to
+
+    Returns:
+        Number of records inserted, or None if any batch failed.
     """
     try:
+        # Bodies go to the compressed, deduplicated side table
+        df, bodies = prepare_bodies(df)
+
         # Prepare insert query
         columns = df.columns.tolist()
         placeholders = ', '.join(['%s'] * len(columns))
@@ -223,65 +255,79 @@ def append_data_to_db(db, df):
         """
         
         # Convert DataFrame to list of tuples
-        values = df.fillna('').to_records(index=False).tolist()
+        values = fill_blanks(df).to_records(index=False).tolist()
         
         # Batch insert
+        failed = False
         batch_size = 1000
         for i in range(0, len(values), batch_size):
             batch = values[i:i+batch_size]
             
             try:
+                insert_bodies(db.cursor, bodies, df.iloc[i:i+batch_size])
                 db.cursor.executemany(insert_query, batch)
+                update_rollups(db.cursor, df.iloc[i:i+batch_size])
                 db.connection.commit()
                 print(f"Inserted batch from {i} to {i+len(batch)}")
             except Exception as batch_error:
                 print(f"Error inserting batch: {batch_error}")
                 db.connection.rollback()
+                failed = True
         
-        print(f"Successfully appended {len(values)} records to {"reddit_posts"}")
+        if failed:
+            return None
+        print(f"Successfully appended {len(values)} records to reddit_posts")
+        return len(values)
     
     except Exception as e:
         print(f"Error during append: {e}")
+        return None
 
-def get_posts_by_subreddit(db_connection, subreddit, limit):  # Added limit parameter
+def get_posts_by_subreddit(db_connection, subreddit, limit, include_body=False):  # Added limit parameter
     """Fetches posts from a specific subreddit with a limit.
 
     Args:
         db_connection: An instance of the DatabaseConnection class.
         subreddit: The name of the subreddit.
         limit: The maximum number of posts to retrieve (default is 10).
+        include_body: Also load each post's text from the body side table.
 
     Returns:
         A list of dictionaries (posts) or None if an error occurs.
     """
 
-    query = "SELECT * FROM reddit_posts WHERE subreddit = %s LIMIT %s;" # Limit added to query
+    query = f"SELECT {POST_LIST_COLUMNS} FROM reddit_posts WHERE subreddit = %s LIMIT %s;" # Limit added to query
     params = (subreddit, limit) # Limit passed as a parameter
     posts = fetch_reddit_data(db_connection, query, params)
+    if posts and include_body:
+        bodies = fetch_post_bodies(db_connection, [post['id'] for post in posts]) or {}
+        for post in posts:
+            post['text'] = bodies.get(post['id'], '')
     return posts
 
 
 
 # Example usage (with limit):
 
-db_conn = DatabaseConnection()
-if db_conn.connect():
-    try:
-        target_subreddit = "nonduality"  # Or any subreddit you want
-        limit = 1 # Set your desired limit
+if __name__ == "__main__":
+    db_conn = DatabaseConnection()
+    if db_conn.connect():
+        try:
+            target_subreddit = "nonduality"  # Or any subreddit you want
+            limit = 1 # Set your desired limit
 
 
-        subreddit_posts = get_posts_by_subreddit(db_conn, target_subreddit, limit)
+            subreddit_posts = get_posts_by_subreddit(db_conn, target_subreddit, limit)
 
 
-        if subreddit_posts:
-            print(f"Posts from r/{target_subreddit} (limit {limit}):")
-            for post in subreddit_posts:
-                for field, value in post.items(): # Iterate through all fields/values
-                    print(f"{field.capitalize()}: {value}") # Print field name and value
-                print("-" * 20)  # Separator between posts
-        else:
-            print(f"No posts found for r/{target_subreddit} or an error occurred.")
+            if subreddit_posts:
+                print(f"Posts from r/{target_subreddit} (limit {limit}):")
+                for post in subreddit_posts:
+                    for field, value in post.items(): # Iterate through all fields/values
+                        print(f"{field.capitalize()}: {value}") # Print field name and value
+                    print("-" * 20)  # Separator between posts
+            else:
+                print(f"No posts found for r/{target_subreddit} or an error occurred.")
 
-    finally:
-        db_conn.disconnect()
\ No newline at end of file
+        finally:
+            db_conn.disconnect()
\ No newline at end of file
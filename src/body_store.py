@@ -0,0 +1,266 @@
+import hashlib
+import sys
+import zlib
+
+import pandas as pd
+from mysql.connector import Error
+
+# Columns list views need; bodies are fetched separately on demand.
+# The side table exists on MySQL only; the Postgres backend keeps text
+# inline in reddit_posts, so it can select text directly.
+POST_LIST_COLUMNS = "id, author, title, url, created_utc, score, num_comments, subreddit"
+
+
+def compress_body(text):
+    """
+    Compress a post body for the side table
+
+    Returns:
+        Tuple of (content_hash, codec, raw_size, compressed bytes)
+    """
+    raw = text.encode('utf-8')
+    content_hash = hashlib.sha256(raw).hexdigest()
+    # zlib needs no extra dependency and, without a shared dictionary,
+    # beats zstd on bodies this short
+    return content_hash, 'zlib', len(raw), zlib.compress(raw, 9)
+
+
+def decompress_body(codec, blob):
+    """Inverse of compress_body"""
+    blob = bytes(blob)
+    if codec == 'zlib':
+        return zlib.decompress(blob).decode('utf-8')
+    return blob.decode('utf-8')
+
+
+def create_body_table(db):
+    """Create reddit_post_bodies and add body_hash to an existing reddit_posts"""
+    create_table_query = """
+    CREATE TABLE IF NOT EXISTS reddit_post_bodies (
+        content_hash CHAR(64) PRIMARY KEY,
+        codec VARCHAR(8) NOT NULL,
+        raw_size INT NOT NULL,
+        body LONGBLOB NOT NULL
+    );
+    """
+    try:
+        db.cursor.execute(create_table_query)
+        db.connection.commit()
+        print("Table 'reddit_post_bodies' created successfully!")
+    except Error as e:
+        print(f"Error creating table reddit_post_bodies: {e}")
+
+    try:
+        db.cursor.execute("ALTER TABLE reddit_posts ADD COLUMN body_hash CHAR(64) NULL;")
+        db.connection.commit()
+    except Error as e:
+        # Skip if the column already exists
+        if e.errno != 1060:  # 1060 is MySQL error for duplicate column
+            print(f"Error adding body_hash column: {e}")
+
+
+def prepare_bodies(df):
+    """
+    Split post bodies out of a batch of posts
+
+    Identical bodies (cross-posts, reposts) are compressed once. Empty
+    bodies get no row and a NULL body_hash.
+
+    Args:
+        df: DataFrame of posts with a text column
+
+    Returns:
+        Tuple of (copy of df with text replaced by body_hash,
+        dict of content_hash -> body row for insert_bodies)
+    """
+    if 'text' not in df.columns:
+        return df, {}
+
+    bodies = {}
+    hashes = []
+    for text in df['text'].fillna(''):
+        if not text:
+            hashes.append(None)
+            continue
+        content_hash, codec, raw_size, blob = compress_body(text)
+        bodies.setdefault(content_hash, (content_hash, codec, raw_size, blob))
+        hashes.append(content_hash)
+
+    df = df.drop(columns=['text'])
+    df['body_hash'] = pd.Series(hashes, index=df.index, dtype=object)
+    return df, bodies
+
+
+def insert_bodies(cursor, bodies, df):
+    """
+    Insert the body rows a batch of posts points at
+
+    Does not commit, so the caller can run it inside the same
+    transaction as the insert into reddit_posts.
+
+    Args:
+        cursor: Cursor on the connection doing the insert
+        bodies: Dict from prepare_bodies
+        df: Batch of posts being inserted, as returned by prepare_bodies
+    """
+    hashes = set(df.get('body_hash', ()))
+    values = [bodies[content_hash] for content_hash in hashes if content_hash]
+    if values:
+        cursor.executemany(
+            "INSERT IGNORE INTO reddit_post_bodies (content_hash, codec, raw_size, body) "
+            "VALUES (%s, %s, %s, %s)",
+            values
+        )
+
+
+def fill_blanks(df):
+    """fillna('') on every column except body_hash, which must stay NULL"""
+    return df.fillna({column: '' for column in df.columns if column != 'body_hash'})
+
+
+def fetch_post_bodies(db, post_ids):
+    """
+    Lazily load the bodies for a set of posts
+
+    Falls back to the legacy text column for rows not yet migrated.
+    MySQL only; Postgres stores text inline in reddit_posts.
+
+    Returns:
+        Dict of post id -> body text, or None if there's an error.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    query = f"""
+    SELECT p.id, p.text, b.codec, b.body
+    FROM reddit_posts p
+    LEFT JOIN reddit_post_bodies b ON b.content_hash = p.body_hash
+    WHERE p.id IN ({placeholders})
+    """
+    try:
+        db.cursor.execute(query, post_ids)
+        rows = db.cursor.fetchall()
+    except Error as e:
+        print(f"Error fetching post bodies: {e}")
+        return None
+
+    return {
+        row['id']: decompress_body(row['codec'], row['body'])
+        if row['body'] is not None else (row['text'] or '')
+        for row in rows
+    }
+
+
+def measure_storage(db):
+    """
+    Report how many bytes post bodies take
+
+    Returns:
+        Dict with inline text bytes, raw and compressed side-table bytes,
+        and on-disk table sizes from information_schema.
+    """
+    stats = {}
+    db.cursor.execute(
+        "SELECT COALESCE(SUM(LENGTH(text)), 0) AS inline_bytes, "
+        "COUNT(body_hash) AS posts_with_body FROM reddit_posts"
+    )
+    stats.update(db.cursor.fetchone())
+    db.cursor.execute(
+        "SELECT COUNT(*) AS distinct_bodies, COALESCE(SUM(raw_size), 0) AS raw_bytes, "
+        "COALESCE(SUM(LENGTH(body)), 0) AS compressed_bytes FROM reddit_post_bodies"
+    )
+    stats.update(db.cursor.fetchone())
+    db.cursor.execute(
+        "SELECT table_name AS name, data_length + index_length AS size "
+        "FROM information_schema.tables WHERE table_schema = DATABASE() "
+        "AND table_name IN ('reddit_posts', 'reddit_post_bodies')"
+    )
+    for row in db.cursor.fetchall():
+        stats[f"{row['name']}_table_bytes"] = row['size']
+    return {key: int(value or 0) for key, value in stats.items()}
+
+
+def measure_list_query(db, subreddit, limit=100):
+    """Compare payload bytes of SELECT * against the slim list columns"""
+    sizes = {}
+    for label, columns in (('select_star', '*'), ('slim', POST_LIST_COLUMNS)):
+        db.cursor.execute(
+            f"SELECT {columns} FROM reddit_posts WHERE subreddit = %s LIMIT %s;",
+            (subreddit, limit)
+        )
+        sizes[label] = sum(
+            len(str(value)) for row in db.cursor.fetchall() for value in row.values()
+            if value is not None
+        )
+    return sizes
+
+
+def migrate_bodies(db, batch_size=1000):
+    """Move inline text of existing rows into the side table"""
+    create_body_table(db)
+    migrated = 0
+    try:
+        while True:
+            db.cursor.execute(
+                "SELECT id, text FROM reddit_posts "
+                "WHERE text IS NOT NULL AND body_hash IS NULL LIMIT %s",
+                (batch_size,)
+            )
+            rows = db.cursor.fetchall()
+            if not rows:
+                break
+
+            bodies = {}
+            updates = []
+            for row in rows:
+                if not row['text']:
+                    updates.append((None, row['id']))
+                    continue
+                content_hash, codec, raw_size, blob = compress_body(row['text'])
+                bodies[content_hash] = (content_hash, codec, raw_size, blob)
+                updates.append((content_hash, row['id']))
+
+            if bodies:
+                db.cursor.executemany(
+                    "INSERT IGNORE INTO reddit_post_bodies (content_hash, codec, raw_size, body) "
+                    "VALUES (%s, %s, %s, %s)",
+                    list(bodies.values())
+                )
+            db.cursor.executemany(
+                "UPDATE reddit_posts SET body_hash = %s, text = NULL WHERE id = %s",
+                updates
+            )
+            db.connection.commit()
+            migrated += len(rows)
+            print(f"Migrated bodies for {migrated} posts")
+    except Error as e:
+        print(f"Error migrating bodies: {e}")
+        db.connection.rollback()
+    return migrated
+
+
+if __name__ == "__main__":
+    from aws_handler import DatabaseConnection
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('migrate', 'measure'):
+        print("Usage: python body_store.py [migrate|measure] [subreddit]")
+        sys.exit(1)
+
+    db_conn = DatabaseConnection()
+    if db_conn.connect():
+        try:
+            if sys.argv[1] == 'migrate':
+                print(f"Before: {measure_storage(db_conn)}")
+                migrate_bodies(db_conn)
+                # Rebuild so pages freed by the NULLed text show up in the sizes
+                db_conn.cursor.execute("OPTIMIZE TABLE reddit_posts, reddit_post_bodies")
+                db_conn.cursor.fetchall()
+                print(f"After: {measure_storage(db_conn)}")
+            else:
+                print(measure_storage(db_conn))
+            if len(sys.argv) > 2:
+                print(f"List query bytes: {measure_list_query(db_conn, sys.argv[2])}")
+        finally:
+            db_conn.disconnect()
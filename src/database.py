@@ -0,0 +1,52 @@
+from settings import Settings
+
+
+def is_postgres_url(url):
+    return bool(url) and url.split(':', 1)[0].startswith('postgres')
+
+
+def get_database_connection(url=None):
+    """
+    Return an unconnected database handle for the configured backend
+
+    Args:
+        url: Optional database URL; defaults to Settings.DATABASE_URL.
+            postgresql:// URLs select the COPY-based Postgres backend,
+            anything else the MySQL DatabaseConnection.
+    """
+    url = url or Settings.DATABASE_URL
+    if is_postgres_url(url):
+        from pg_handler import PostgresConnection
+        return PostgresConnection(url)
+
+    from aws_handler import DatabaseConnection
+    return DatabaseConnection()
+
+
+def save_scraped_data(db, scraped_data):
+    """
+    Write scraped posts with the fastest path for the backend
+
+    Returns:
+        Number of records written, or None if the save failed.
+    """
+    from pg_handler import PostgresConnection
+
+    if isinstance(db, PostgresConnection):
+        from pg_handler import copy_scraped_data_to_db
+        return copy_scraped_data_to_db(db, scraped_data)
+
+    from aws_handler import import_scraped_data_to_db
+    return import_scraped_data_to_db(db, scraped_data)
+
+
+def fetch_rollup_trends(db, subreddits=None, granularity='day', since=None):
+    """Read activity trends from the rollup tables of the backend"""
+    from pg_handler import PostgresConnection
+
+    if isinstance(db, PostgresConnection):
+        from pg_handler import fetch_rollup_trends as fetch_pg_rollup_trends
+        return fetch_pg_rollup_trends(db, subreddits, granularity, since)
+
+    from rollups import fetch_rollup_trends as fetch_mysql_rollup_trends
+    return fetch_mysql_rollup_trends(db, subreddits, granularity, since)
@@ -0,0 +1,328 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import prawcore
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MODES = ('off', 'cache', 'record', 'replay')
+
+# Path pattern -> seconds a cached response stays fresh; first match wins
+DEFAULT_TTLS = [
+    (r'/api/v1/access_token', 0),
+    (r'/r/[^/]+/(new|hot|rising|top|controversial)', 300),
+    (r'/comments/', 3600),
+    (r'/(r|user)/[^/]+/about', 86400),
+]
+DEFAULT_TTL = 600
+
+# Writable stores with access times that may still be buffered
+_open_stores = weakref.WeakSet()
+
+
+def flush_open_stores():
+    """
+    Write the buffered access times of every open store
+
+    Runs at interpreter exit. Worker processes skip atexit handlers, so
+    they call it themselves before returning.
+    """
+    for store in list(_open_stores):
+        store.flush()
+
+
+atexit.register(flush_open_stores)
+
+
+class ReplayMissError(Exception):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class ResponseStore:
+    """
+    Content-addressed on-disk store for HTTP responses
+
+    Bodies live under objects/ keyed by their SHA-256, so identical
+    payloads are stored once; a SQLite index maps request keys to bodies
+    and tracks access times for least-recently-used eviction. Access
+    times are written in batches and the byte total is kept in memory,
+    so cache hits do not write to the index. A read-only store (replay)
+    never writes at all.
+
+    Several processes may share one cache directory, so the byte total
+    is re-read from the index every SYNC_PUTS puts and before evicting.
+    """
+
+    # Cache hits buffered before their access times are written
+    TOUCH_BATCH = 100
+    # Puts between re-reads of the shared byte total
+    SYNC_PUTS = 100
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, readonly=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.readonly = readonly
+        self._touched = {}
+        self._puts = 0
+        index_path = os.path.join(cache_dir, 'index.sqlite')
+
+        if readonly:
+            self.db = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+            self._total = None
+            return
+
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        self.db = sqlite3.connect(index_path, timeout=30)
+        self.db.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            headers TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries(accessed_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_content ON entries(content_hash)")
+        self.db.commit()
+        # put/evict keep this current between re-reads
+        self._total = self.total_bytes()
+        _open_stores.add(self)
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.cache_dir, 'objects', content_hash[:2], content_hash)
+
+    def _is_referenced(self, content_hash):
+        return self.db.execute(
+            "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone() is not None
+
+    def _release(self, content_hash, size):
+        """Delete a body no entry points at any more"""
+        if self._is_referenced(content_hash):
+            return
+        self._total -= size
+        try:
+            os.remove(self._object_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    def get(self, key):
+        """Return the stored entry for a request key, or None"""
+        row = self.db.execute(
+            "SELECT content_hash, status, url, headers, stored_at FROM entries WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        content_hash, status, url, headers, stored_at = row
+        try:
+            with open(self._object_path(content_hash), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+
+        if not self.readonly:
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self.flush()
+        return {
+            'status': status,
+            'url': url,
+            'headers': json.loads(headers),
+            'body': body,
+            'stored_at': stored_at
+        }
+
+    def flush(self):
+        """Write buffered access times to the index"""
+        if self.readonly or not self._touched:
+            return
+        self.db.executemany(
+            "UPDATE entries SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()]
+        )
+        self.db.commit()
+        self._touched.clear()
+
+    def put(self, key, status, url, headers, body):
+        """Store a response body and point the request key at it"""
+        if self.readonly:
+            raise RuntimeError("Cannot write to a read-only response store")
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        previous = self.db.execute(
+            "SELECT content_hash, size FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if not self._is_referenced(content_hash):
+            self._total += len(body)
+
+        now = time.time()
+        self._touched.pop(key, None)
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, content_hash, len(body), status, url, json.dumps(dict(headers)), now, now)
+        )
+        if previous is not None and previous[0] != content_hash:
+            self._release(*previous)
+        self.db.commit()
+
+        self._puts += 1
+        if self._puts % self.SYNC_PUTS == 0:
+            # Pick up what other processes have added since
+            self._total = self.total_bytes()
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def total_bytes(self):
+        """Bytes on disk, counting each distinct body once"""
+        row = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT DISTINCT content_hash, size FROM entries)"
+        ).fetchone()
+        return row[0]
+
+    def evict(self):
+        """Drop least recently used entries once over max_bytes"""
+        if self.readonly:
+            return
+        self._total = self.total_bytes()
+        if self._total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so a full cache doesn't rescan on every put
+        target = self.max_bytes * 0.9
+        self.flush()
+        rows = self.db.execute(
+            "SELECT key, content_hash, size FROM entries ORDER BY accessed_at"
+        )
+        for key, content_hash, size in rows.fetchall():
+            if self._total <= target:
+                break
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._release(content_hash, size)
+        self.db.commit()
+
+    def close(self):
+        """Flush pending access times and close the index"""
+        self.flush()
+        _open_stores.discard(self)
+        self.db.close()
+
+
+class CachingRequestor(prawcore.Requestor):
+    """
+    prawcore requestor that serves Reddit API calls from a ResponseStore
+
+    Modes:
+        off: Pass every request through
+        cache: Serve GET responses while fresh under the per-endpoint TTL
+        record: Always hit the network and store every response
+        replay: Serve everything from the store, never touch the network
+    """
+
+    def __init__(
+        self,
+        *args,
+        cache_dir='.http_cache',
+        mode='cache',
+        ttls=None,
+        default_ttl=DEFAULT_TTL,
+        max_bytes=512 * 1024 * 1024,
+        **kwargs
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP cache mode {mode!r}, expected one of {MODES}")
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or DEFAULT_TTLS)]
+        self.default_ttl = default_ttl
+        self.store = None
+        if mode != 'off':
+            self.store = ResponseStore(cache_dir, max_bytes, readonly=mode == 'replay')
+
+    def close(self):
+        """Flush and close the response store, then the HTTP session"""
+        if self.store is not None:
+            self.store.close()
+        super().close()
+
+    def ttl_for(self, url):
+        """Seconds a response for this URL stays fresh"""
+        path = urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def cache_key(method, url, params=None, data=None, json_body=None):
+        """Stable key for a request; auth headers are deliberately left out"""
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        if isinstance(data, dict):
+            data = sorted(data.items())
+        payload = json.dumps(
+            [method.upper(), url, params, data, json_body], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _build_response(entry):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry['url']
+        # Stale rate-limit headers would throttle the live limiter
+        response.headers = CaseInsensitiveDict({
+            name: value for name, value in entry['headers'].items()
+            if not name.lower().startswith('x-ratelimit')
+        })
+        response._content = entry['body']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def request(self, method, url, *args, **kwargs):
+        if self.mode == 'off':
+            return super().request(method, url, *args, **kwargs)
+
+        key = self.cache_key(
+            method, url, kwargs.get('params'), kwargs.get('data'), kwargs.get('json')
+        )
+
+        if self.mode == 'replay':
+            entry = self.store.get(key)
+            if entry is None:
+                raise ReplayMissError(f"No recorded response for {method.upper()} {url}")
+            return self._build_response(entry)
+
+        cacheable = self.mode == 'record' or method.upper() == 'GET'
+        if self.mode == 'cache' and cacheable:
+            entry = self.store.get(key)
+            if entry is not None and time.time() - entry['stored_at'] < self.ttl_for(url):
+                return self._build_response(entry)
+
+        response = super().request(method, url, *args, **kwargs)
+        if cacheable and (self.mode == 'record' or response.status_code == 200):
+            self.store.put(
+                key, response.status_code, response.url, response.headers, response.content
+            )
+        return response
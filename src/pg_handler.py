@@ -0,0 +1,260 @@
+import io
+import time
+
+import pandas as pd
+from sqlalchemy import (
+    BigInteger, Column, Date, DateTime, Index, Integer, MetaData, String,
+    Table, Text, create_engine, func, select, text
+)
+from sqlalchemy.exc import SQLAlchemyError
+
+from rollups import add_rollup_averages
+from settings import Settings
+
+POST_COLUMNS = [
+    'id', 'author', 'title', 'text', 'url', 'created_utc',
+    'score', 'num_comments', 'subreddit'
+]
+
+metadata = MetaData()
+
+# Same columns as create_reddit_table in aws_handler.py, except that
+# Postgres keeps text inline: it has no body_hash column and no
+# reddit_post_bodies side table (see body_store.py)
+reddit_posts = Table(
+    'reddit_posts', metadata,
+    Column('id', String(255), primary_key=True),
+    Column('author', String(255), nullable=False),
+    Column('title', Text, nullable=False),
+    Column('text', Text),
+    Column('url', Text),
+    Column('created_utc', DateTime),
+    Column('score', Integer, server_default='0'),
+    Column('num_comments', Integer, server_default='0'),
+    Column('subreddit', String(255), nullable=False),
+    Column('created_at', DateTime, server_default=func.now()),
+    Column('updated_at', DateTime, server_default=func.now()),
+    Index('idx_author', 'author'),
+    Index('idx_subreddit', 'subreddit'),
+    Index('idx_created_utc', 'created_utc'),
+    Index('idx_score', 'score'),
+)
+
+# Postgres counterparts of the rollup tables in rollups.py
+ROLLUP_TABLES = {
+    'day': ('reddit_rollup_daily', Date, "date_trunc('day', created_utc)::date"),
+    'hour': ('reddit_rollup_hourly', DateTime, "date_trunc('hour', created_utc)"),
+}
+
+# Picks one staged row per id; the rollup deltas and the upsert must use
+# the same one, so the last row copied in wins in both
+LATEST_STAGED_ROW = (
+    "DISTINCT ON (s.id) {columns} FROM reddit_posts_staging s "
+    "ORDER BY s.id, s.seq DESC"
+)
+for _table, _bucket_type, _ in ROLLUP_TABLES.values():
+    Table(
+        _table, metadata,
+        Column('subreddit', String(255), primary_key=True),
+        Column('bucket', _bucket_type, primary_key=True),
+        Column('post_count', Integer, nullable=False, server_default='0'),
+        Column('total_score', BigInteger, nullable=False, server_default='0'),
+        Column('total_comments', BigInteger, nullable=False, server_default='0'),
+        Index(f'idx_{_table}_bucket', 'bucket'),
+    )
+
+
+class PostgresConnection:
+    def __init__(self, url=None):
+        self.url = url or Settings.get_database_url()
+        self.engine = None
+
+    def connect(self):
+        """Create the engine and check the database is reachable"""
+        try:
+            self.engine = create_engine(self.url, pool_pre_ping=True)
+            with self.engine.connect() as connection:
+                version = connection.execute(text("SHOW server_version")).scalar()
+            print(f"Successfully connected to PostgreSQL database version {version}")
+            return True
+        except SQLAlchemyError as e:
+            print(f"Error connecting to PostgreSQL Database: {e}")
+            return False
+
+    def disconnect(self):
+        """Dispose of the connection pool"""
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+            print("Database connection closed")
+
+
+def create_reddit_table(db):
+    """Create reddit_posts, its indexes and the rollup tables"""
+    try:
+        metadata.create_all(db.engine)
+        print("Table 'reddit_posts' created successfully!")
+    except SQLAlchemyError as e:
+        print(f"Error creating table: {e}")
+
+
+def _csv_chunks(df, chunk_size):
+    """Yield in-memory CSV buffers of at most chunk_size rows"""
+    for i in range(0, len(df), chunk_size):
+        buffer = io.StringIO()
+        df.iloc[i:i + chunk_size].to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        yield buffer
+
+
+def copy_scraped_data_to_db(db, scraped_data, chunk_size=50000):
+    """
+    Bulk-load posts with COPY and upsert them into reddit_posts
+
+    Rows are streamed into a temporary staging table through COPY FROM
+    STDIN, then merged with INSERT ... ON CONFLICT. Rollup tables get
+    new posts plus the score/comment deltas of re-scraped ones, all in
+    one transaction, so they stay equal to a full rebuild.
+
+    Args:
+        db: A connected PostgresConnection
+        scraped_data: DataFrame or list of post dicts
+        chunk_size: Rows per in-memory COPY buffer
+
+    Returns:
+        Number of rows loaded, or None if the import failed.
+    """
+    df = pd.DataFrame(scraped_data)
+    if df.empty:
+        print("No records to import")
+        return 0
+
+    df = df.reindex(columns=POST_COLUMNS)
+    created = pd.to_datetime(df['created_utc'], utc=True)
+    df['created_utc'] = created.dt.tz_localize(None)
+    columns = ', '.join(POST_COLUMNS)
+    staged_columns = ', '.join(f's.{column}' for column in POST_COLUMNS)
+
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # seq numbers rows in COPY order, the tiebreak for repeated ids
+        cursor.execute(
+            "CREATE TEMP TABLE reddit_posts_staging "
+            "(LIKE reddit_posts INCLUDING DEFAULTS, seq BIGSERIAL) ON COMMIT DROP"
+        )
+
+        started = time.monotonic()
+        for buffer in _csv_chunks(df, chunk_size):
+            # Unquoted empty fields mean NULL in CSV; keep '' for text
+            # columns to match what the MySQL path stores
+            cursor.copy_expert(
+                f"COPY reddit_posts_staging ({columns}) FROM STDIN WITH "
+                f"(FORMAT csv, FORCE_NOT_NULL (author, title, text, url))",
+                buffer
+            )
+
+        for table, _, bucket_expr in ROLLUP_TABLES.values():
+            cursor.execute(f"""
+            INSERT INTO {table} AS r (subreddit, bucket, post_count, total_score, total_comments)
+            SELECT subreddit, {bucket_expr}, SUM(is_new), SUM(score_delta),
+                   SUM(comments_delta)
+            FROM (
+                SELECT
+                    COALESCE(p.subreddit, s.subreddit) AS subreddit,
+                    COALESCE(p.created_utc, s.created_utc) AS created_utc,
+                    (p.id IS NULL)::int AS is_new,
+                    COALESCE(s.score, 0) - COALESCE(p.score, 0) AS score_delta,
+                    COALESCE(s.num_comments, 0) - COALESCE(p.num_comments, 0) AS comments_delta
+                FROM (SELECT {LATEST_STAGED_ROW.format(columns='s.*')}) AS s
+                LEFT JOIN reddit_posts p ON p.id = s.id
+            ) AS changes
+            WHERE created_utc IS NOT NULL
+              AND (is_new = 1 OR score_delta <> 0 OR comments_delta <> 0)
+            GROUP BY subreddit, {bucket_expr}
+            ON CONFLICT (subreddit, bucket) DO UPDATE SET
+                post_count = r.post_count + EXCLUDED.post_count,
+                total_score = r.total_score + EXCLUDED.total_score,
+                total_comments = r.total_comments + EXCLUDED.total_comments
+            """)
+
+        cursor.execute(f"""
+        INSERT INTO reddit_posts ({columns})
+        SELECT {LATEST_STAGED_ROW.format(columns=staged_columns)}
+        ON CONFLICT (id) DO UPDATE SET
+            title = EXCLUDED.title,
+            text = EXCLUDED.text,
+            score = EXCLUDED.score,
+            num_comments = EXCLUDED.num_comments,
+            updated_at = CURRENT_TIMESTAMP
+        """)
+        connection.commit()
+
+        elapsed = time.monotonic() - started
+        print(f"Data import completed. {len(df)} records copied in {elapsed:.2f}s.")
+        return len(df)
+
+    except Exception as e:
+        print(f"Error during import: {e}")
+        connection.rollback()
+        return None
+    finally:
+        connection.close()
+
+
+def fetch_rollup_trends(db, subreddits=None, granularity='day', since=None):
+    """
+    Read activity trends from the Postgres rollup tables only
+
+    Same arguments and result as rollups.fetch_rollup_trends.
+    """
+    table = metadata.tables[ROLLUP_TABLES[granularity][0]]
+    columns = ['subreddit', 'bucket', 'post_count', 'total_score', 'total_comments']
+    query = select(*(table.c[column] for column in columns)).order_by(table.c.bucket)
+    if subreddits:
+        query = query.where(table.c.subreddit.in_(subreddits))
+    if since is not None:
+        query = query.where(table.c.bucket >= since)
+
+    try:
+        with db.engine.connect() as connection:
+            df = pd.DataFrame(connection.execute(query).fetchall(), columns=columns)
+    except SQLAlchemyError as e:
+        print(f"Error fetching rollups: {e}")
+        return pd.DataFrame()
+
+    return add_rollup_averages(df)
+
+
+def rebuild_rollups(db):
+    """Recompute every rollup table from reddit_posts in one transaction"""
+    try:
+        with db.engine.begin() as connection:
+            for table, _, bucket_expr in ROLLUP_TABLES.values():
+                connection.execute(text(f"DELETE FROM {table}"))
+                connection.execute(text(f"""
+                INSERT INTO {table} (subreddit, bucket, post_count, total_score, total_comments)
+                SELECT subreddit, {bucket_expr}, COUNT(*), COALESCE(SUM(score), 0),
+                       COALESCE(SUM(num_comments), 0)
+                FROM reddit_posts
+                WHERE created_utc IS NOT NULL
+                GROUP BY subreddit, {bucket_expr}
+                """))
+        print("Rollup tables rebuilt successfully!")
+    except SQLAlchemyError as e:
+        print(f"Error rebuilding rollups: {e}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_conn = PostgresConnection()
+    if db_conn.connect():
+        try:
+            create_reddit_table(db_conn)
+            if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+                rebuild_rollups(db_conn)
+            elif len(sys.argv) > 1:
+                copy_scraped_data_to_db(db_conn, pd.read_csv(sys.argv[1]))
+        finally:
+            db_conn.disconnect()
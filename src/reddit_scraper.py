@@ -1,11 +1,13 @@
 import praw
 import prawcore
 import pandas as pd
-from datetime import datetime, timezone
+from datetime import datetime
 import logging
 import os
 from typing import List, Optional
 from src.settings import Settings
+from src.http_cache import CachingRequestor
+from src.post_records import PostColumns
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -29,14 +31,19 @@ def setup_logging() -> logging.Logger:
 class RedditScraper:
     """Comprehensive Reddit post scraper"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, credentials=None, trend_index=None):
         """
         Initialize Reddit scraper
         
         Args:
             logger: Optional logger instance
+            credentials: Optional dict with client_id, client_secret and
+                user_agent; defaults to the primary app from Settings
+            trend_index: Optional TrendIndex fed with every scraped batch
         """
         self.logger = logger or setup_logging()
+        self.credentials = credentials
+        self.trend_index = trend_index
         self.reddit_client = self._setup_reddit_client()
 
     def _setup_reddit_client(self):
@@ -49,8 +56,14 @@ class RedditScraper:
         Raises:
             ValueError: If client setup fails
         """
+        credentials = self.credentials or {
+            'client_id': Settings.REDDIT_CLIENT_ID,
+            'client_secret': Settings.REDDIT_CLIENT_SECRET,
+            'user_agent': Settings.REDDIT_USER_AGENT
+        }
+
         # Validate credentials
-        if not Settings.validate_reddit_credentials():
+        if not all(credentials.values()):
             self.logger.error("Missing Reddit API credentials")
             raise ValueError(
                 "Missing Reddit API credentials. Please set REDDIT_CLIENT_ID, "
@@ -61,9 +74,10 @@ class RedditScraper:
             self.logger.info("Attempting to create Reddit client")
             
             reddit = praw.Reddit(
-                client_id=Settings.REDDIT_CLIENT_ID,
-                client_secret=Settings.REDDIT_CLIENT_SECRET,
-                user_agent=Settings.REDDIT_USER_AGENT
+                client_id=credentials['client_id'],
+                client_secret=credentials['client_secret'],
+                user_agent=credentials['user_agent'],
+                **self._requestor_options()
             )
 
             # Verify API access
@@ -77,6 +91,26 @@ class RedditScraper:
             self.logger.error(f"PRAW Core Exception: {e}")
             raise
 
+    def _requestor_options(self):
+        """
+        Route API calls through the on-disk response cache if enabled
+        
+        Returns:
+            Extra praw.Reddit keyword arguments
+        """
+        if Settings.HTTP_CACHE_MODE == 'off':
+            return {}
+
+        self.logger.info(f"HTTP cache in {Settings.HTTP_CACHE_MODE} mode at {Settings.HTTP_CACHE_DIR}")
+        return {
+            'requestor_class': CachingRequestor,
+            'requestor_kwargs': {
+                'cache_dir': Settings.HTTP_CACHE_DIR,
+                'mode': Settings.HTTP_CACHE_MODE,
+                'max_bytes': Settings.HTTP_CACHE_MAX_MB * 1024 * 1024
+            }
+        }
+
     def scrape_subreddit(
         self, 
         subreddit_names: Optional[List[str]] = None,
@@ -102,7 +136,11 @@ class RedditScraper:
         # Use default subreddits if not specified
         subreddit_names = subreddit_names or Settings.DEFAULT_SUBREDDITS
 
-        all_posts_data = []
+        # Compare raw epoch seconds instead of building a datetime per post
+        start_ts = start_date.timestamp() if start_date else None
+        end_ts = end_date.timestamp() if end_date else None
+
+        all_posts_data = PostColumns()
 
         for subreddit_name in subreddit_names:
             try:
@@ -110,29 +148,13 @@ class RedditScraper:
                 
                 posts_collected = 0
                 for post in subreddit.new(limit=None):
-                    # Convert post creation time
-                    post_time = datetime.fromtimestamp(
-                        post.created_utc, 
-                        tz=timezone.utc
-                    )
-                    
                     # Apply date filtering
-                    if start_date and post_time < start_date:
+                    if start_ts is not None and post.created_utc < start_ts:
                         break
-                    if end_date and post_time > end_date:
+                    if end_ts is not None and post.created_utc > end_ts:
                         continue
                     
-                    all_posts_data.append({
-                        'id': post.id,
-                        'author': str(post.author),
-                        'title': post.title,
-                        'text': post.selftext,
-                        'url': f"https://reddit.com{post.permalink}",
-                        'created_utc': post_time,
-                        'score': post.score,
-                        'num_comments': post.num_comments,
-                        'subreddit': subreddit_name
-                    })
+                    all_posts_data.append(post, subreddit_name)
                     
                     posts_collected += 1
                     # Stop if we've reached the limit
@@ -151,7 +173,13 @@ class RedditScraper:
                 self.logger.error(f"Error collecting posts from {subreddit_name}: {e}")
 
         # Convert to DataFrame
-        return pd.DataFrame(all_posts_data)
+        df = all_posts_data.to_dataframe()
+
+        # Tokenize the new batch once for trending terms
+        if self.trend_index is not None:
+            self.trend_index.add_posts(df)
+
+        return df
 
 if __name__ == '__main__':
     # Initialize the scraper
@@ -0,0 +1,186 @@
+import sys
+
+import pandas as pd
+from mysql.connector import Error
+
+
+# Granularity -> (table, bucket column, bucket SQL type, pandas freq, SQL bucket expression)
+ROLLUPS = {
+    'day': ('reddit_rollup_daily', 'bucket', 'DATE', 'D', "DATE(created_utc)"),
+    'hour': (
+        'reddit_rollup_hourly', 'bucket', 'DATETIME', 'h',
+        "DATE_FORMAT(created_utc, '%Y-%m-%d %H:00:00')"
+    ),
+}
+
+
+def create_rollup_tables(db):
+    """Create the per-subreddit day/hour rollup tables if missing"""
+    for table, bucket, bucket_type, _, _ in ROLLUPS.values():
+        create_table_query = f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            subreddit VARCHAR(255) NOT NULL,
+            {bucket} {bucket_type} NOT NULL,
+            post_count INT NOT NULL DEFAULT 0,
+            total_score BIGINT NOT NULL DEFAULT 0,
+            total_comments BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (subreddit, {bucket}),
+            INDEX idx_{table}_bucket ({bucket})
+        );
+        """
+        try:
+            db.cursor.execute(create_table_query)
+            db.connection.commit()
+            print(f"Table '{table}' created successfully!")
+        except Error as e:
+            print(f"Error creating table {table}: {e}")
+
+
+def filter_new_posts(cursor, df):
+    """Drop repeated ids and rows whose id already exists in reddit_posts"""
+    if df.empty:
+        return df
+    # INSERT IGNORE stores only the first of several rows with one id
+    df = df.drop_duplicates('id')
+    ids = df['id'].tolist()
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id FROM reddit_posts WHERE id IN ({placeholders})", ids)
+    existing = {row['id'] for row in cursor.fetchall()}
+    return df[~df['id'].isin(existing)]
+
+
+def update_rollups(cursor, df):
+    """
+    Add a batch of newly inserted posts to the rollup tables
+
+    Does not commit, so the caller can run it inside the same
+    transaction as the insert into reddit_posts.
+
+    Args:
+        cursor: Cursor on the connection doing the insert
+        df: DataFrame of new posts (subreddit, created_utc, score, num_comments)
+    """
+    if df.empty:
+        return
+
+    created = pd.to_datetime(df['created_utc'], utc=True).dt.tz_localize(None)
+    score = pd.to_numeric(df['score'], errors='coerce').fillna(0)
+    comments = pd.to_numeric(df['num_comments'], errors='coerce').fillna(0)
+
+    for table, bucket, _, freq, _ in ROLLUPS.values():
+        grouped = pd.DataFrame({
+            'subreddit': df['subreddit'].values,
+            'bucket': created.dt.floor(freq).values,
+            'score': score.values,
+            'comments': comments.values,
+        }).groupby(['subreddit', 'bucket']).agg(
+            post_count=('score', 'size'),
+            total_score=('score', 'sum'),
+            total_comments=('comments', 'sum'),
+        ).reset_index()
+
+        upsert_query = f"""
+        INSERT INTO {table} (subreddit, {bucket}, post_count, total_score, total_comments)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            post_count = post_count + VALUES(post_count),
+            total_score = total_score + VALUES(total_score),
+            total_comments = total_comments + VALUES(total_comments)
+        """
+        values = [
+            (row.subreddit, row.bucket.to_pydatetime(), int(row.post_count),
+             int(row.total_score), int(row.total_comments))
+            for row in grouped.itertuples(index=False)
+        ]
+        cursor.executemany(upsert_query, values)
+
+
+def rebuild_rollups(db):
+    """Recompute every rollup table from reddit_posts in one transaction"""
+    try:
+        for table, bucket, _, _, bucket_expr in ROLLUPS.values():
+            # DELETE rather than TRUNCATE, which would commit implicitly
+            db.cursor.execute(f"DELETE FROM {table}")
+            db.cursor.execute(f"""
+            INSERT INTO {table} (subreddit, {bucket}, post_count, total_score, total_comments)
+            SELECT subreddit, {bucket_expr}, COUNT(*), COALESCE(SUM(score), 0),
+                   COALESCE(SUM(num_comments), 0)
+            FROM reddit_posts
+            WHERE created_utc IS NOT NULL
+            GROUP BY subreddit, {bucket_expr}
+            """)
+        db.connection.commit()
+        print("Rollup tables rebuilt successfully!")
+    except Error as e:
+        print(f"Error rebuilding rollups: {e}")
+        db.connection.rollback()
+
+
+def fetch_rollup_trends(db, subreddits=None, granularity='day', since=None):
+    """
+    Read activity trends from the rollup tables only
+
+    Args:
+        db: An instance of the DatabaseConnection class
+        subreddits: Optional list of subreddits to include
+        granularity: 'day' or 'hour'
+        since: Optional datetime lower bound for the bucket
+
+    Returns:
+        DataFrame with subreddit, bucket, post_count, total_score,
+        total_comments, avg_score and avg_comments columns.
+    """
+    table, bucket, _, _, _ = ROLLUPS[granularity]
+    query = f"""
+    SELECT subreddit, {bucket} AS bucket, post_count, total_score, total_comments
+    FROM {table}
+    """
+    conditions = []
+    params = []
+    if subreddits:
+        conditions.append(f"subreddit IN ({', '.join(['%s'] * len(subreddits))})")
+        params.extend(subreddits)
+    if since is not None:
+        conditions.append(f"{bucket} >= %s")
+        params.append(since)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {bucket}"
+
+    try:
+        db.cursor.execute(query, params)
+        df = pd.DataFrame(
+            db.cursor.fetchall(),
+            columns=['subreddit', 'bucket', 'post_count', 'total_score', 'total_comments']
+        )
+    except Error as e:
+        print(f"Error fetching rollups: {e}")
+        return pd.DataFrame()
+
+    return add_rollup_averages(df)
+
+
+def add_rollup_averages(df):
+    """Parse buckets and add avg_score/avg_comments to fetched rollup rows"""
+    df['bucket'] = pd.to_datetime(df['bucket'])
+    counts = df['post_count'].where(df['post_count'] > 0)
+    df['avg_score'] = df['total_score'] / counts
+    df['avg_comments'] = df['total_comments'] / counts
+    return df
+
+
+if __name__ == "__main__":
+    from aws_handler import DatabaseConnection
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('create', 'rebuild'):
+        print("Usage: python rollups.py [create|rebuild]")
+        sys.exit(1)
+
+    db_conn = DatabaseConnection()
+    if db_conn.connect():
+        try:
+            create_rollup_tables(db_conn)
+            if sys.argv[1] == 'rebuild':
+                rebuild_rollups(db_conn)
+        finally:
+            db_conn.disconnect()
@@ -1,9 +1,57 @@
 import streamlit as st
 import pandas as pd
 import mysql.connector
+import plotly.express as px
 from reddit import RedditScraper
 from settings import Settings
-from aws_handler import DatabaseConnection
+from database import fetch_rollup_trends, get_database_connection, save_scraped_data
+
+METRICS = {
+    "Posts": "post_count",
+    "Total score": "total_score",
+    "Average score": "avg_score",
+    "Total comments": "total_comments",
+    "Average comments": "avg_comments",
+}
+
+
+def render_trends_view():
+    """Plot subreddit activity over time from the rollup tables"""
+    st.header("📈 Activity Trends")
+
+    subreddit_input = st.sidebar.text_input(
+        "Subreddits to chart (comma-separated, blank for all)",
+        placeholder="technology, programming"
+    )
+    granularity = st.sidebar.radio("Granularity", ["day", "hour"])
+    days = st.sidebar.slider("Days of history", min_value=1, max_value=365, value=30)
+    metric = st.sidebar.selectbox("Metric", list(METRICS))
+
+    subreddits = [sub.strip() for sub in subreddit_input.split(',') if sub.strip()]
+    since = pd.Timestamp.now('UTC').tz_localize(None).floor('D') - pd.Timedelta(days=days)
+
+    db = get_database_connection()
+    if not db.connect():
+        st.error("Failed to establish database connection")
+        return
+    try:
+        df = fetch_rollup_trends(db, subreddits, granularity, since.to_pydatetime())
+    finally:
+        db.disconnect()
+
+    if df.empty:
+        st.info("No rollup data for this selection yet")
+        return
+
+    fig = px.line(
+        df,
+        x="bucket",
+        y=METRICS[metric],
+        color="subreddit",
+        markers=True,
+        labels={"bucket": granularity.capitalize(), METRICS[metric]: metric}
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 def create_streamlit_app():
     # Set page title and icon
@@ -13,6 +61,11 @@ def create_streamlit_app():
     st.title("🔍 Reddit Data Scraper")
     st.write("Scrape Reddit posts and save them to your database")
     
+    view = st.sidebar.radio("View", ["Scraper", "Trends"])
+    if view == "Trends":
+        render_trends_view()
+        return
+
     # Sidebar for configuration
     st.sidebar.header("Scraper Configuration")
     
@@ -68,44 +121,21 @@ def create_streamlit_app():
             # Option to save to database
             if st.button("Save to Database"):
                 try:
-                    # Establish database connection
-                    db = DatabaseConnection()
+                    # Establish database connection; DATABASE_URL picks the backend
+                    db = get_database_connection()
                     connect = db.connect()
                     
                     if connect:
-                        # Function to append data
-                        def append_data_to_db(connection, df, table_name):
-                            try:
-                                # Prepare cursor
-                                cursor = connection.cursor()
-                                
-                                # Prepare insert query
-                                columns = df.columns.tolist()
-                                placeholders = ', '.join(['%s'] * len(columns))
-                                column_names = ', '.join(columns)
-                                
-                                insert_query = f"""
-                                INSERT INTO {table_name} ({column_names})
-                                VALUES ({placeholders})
-                                """
-                                
-                                # Convert DataFrame to list of tuples
-                                values = df.fillna('').to_records(index=False).tolist()
-                                
-                                # Execute batch insert
-                                cursor.executemany(insert_query, values)
-                                connection.commit()
-                                
-                                st.success(f"Successfully inserted {len(values)} records")
-                                return True
-                            
-                            except Exception as e:
-                                st.error(f"Error inserting data: {e}")
-                                connection.rollback()
-                                return False
+                        try:
+                            # Rollup tables are updated in the same transaction
+                            saved = save_scraped_data(db, df)
+                        finally:
+                            db.disconnect()
                         
-                        # Attempt to save to database
-                        result = append_data_to_db(connect, df, 'reddit_posts')
+                        if saved is None:
+                            st.error("Failed to save records to the database")
+                        else:
+                            st.success(f"Saved {saved} records to the database")
                     
                     else:
                         st.error("Failed to establish database connection")
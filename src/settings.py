@@ -10,17 +10,38 @@ class Settings:
     REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
     REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT')
     
+    # Extra OAuth apps for sharded scraping, as "id:secret,id:secret"
+    REDDIT_CREDENTIALS = os.getenv('REDDIT_CREDENTIALS')
+
+    # Database settings; DATABASE_URL picks the backend by its scheme
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    DB_USERNAME = os.getenv('DB_USERNAME')
+    DB_PASSWORD = os.getenv('DB_PASSWORD')
+    DB_HOST = os.getenv('DB_HOST')
+    DB_PORT = os.getenv('DB_PORT', '5432')
+    DB_NAME = os.getenv('DB_NAME')
+    
     # Scraper settings
     DEFAULT_POST_LIMIT = 10
     DEFAULT_SUBREDDITS = ['python', 'learnpython']
     
+    # HTTP response cache: off, cache, record or replay
+    HTTP_CACHE_MODE = os.getenv('HTTP_CACHE_MODE', 'off')
+    HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+    HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '512'))
+    
+    # Sharded scraper settings; unset means one shard per credential
+    SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', '0')) or None
+    
     @classmethod
     def get_database_url(cls):
+        if cls.DATABASE_URL:
+            return cls.DATABASE_URL
         return (
             f"postgresql://{cls.DB_USERNAME}:{cls.DB_PASSWORD}@"
             f"{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
         )
-    
+
     @classmethod
     def validate_reddit_credentials(cls):
         return all([
@@ -28,3 +49,34 @@ class Settings:
             cls.REDDIT_CLIENT_SECRET,
             cls.REDDIT_USER_AGENT
         ])
+
+    @classmethod
+    def get_reddit_credentials(cls):
+        """
+        Return the pool of Reddit OAuth credentials
+
+        The primary REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET pair comes first,
+        followed by any pairs listed in REDDIT_CREDENTIALS. All entries
+        share REDDIT_USER_AGENT.
+        """
+        credentials = []
+        if cls.validate_reddit_credentials():
+            credentials.append({
+                'client_id': cls.REDDIT_CLIENT_ID,
+                'client_secret': cls.REDDIT_CLIENT_SECRET,
+                'user_agent': cls.REDDIT_USER_AGENT
+            })
+
+        for entry in (cls.REDDIT_CREDENTIALS or '').split(','):
+            client_id, _, client_secret = entry.strip().partition(':')
+            if not client_id or not client_secret:
+                continue
+            credential = {
+                'client_id': client_id,
+                'client_secret': client_secret,
+                'user_agent': cls.REDDIT_USER_AGENT
+            }
+            if credential not in credentials:
+                credentials.append(credential)
+
+        return credentials
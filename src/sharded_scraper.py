@@ -0,0 +1,260 @@
+import bisect
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from settings import Settings
+from utils.logging import setup_logging
+
+
+class HashRing:
+    """Consistent hash ring mapping subreddits to shards"""
+
+    def __init__(self, nodes: List[int], replicas: int = 64):
+        """
+        Build the ring
+
+        Args:
+            nodes: Shard identifiers
+            replicas: Virtual nodes per shard, smooths the distribution
+        """
+        self.replicas = replicas
+        self._keys = []
+        self._nodes = {}
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+    def add_node(self, node: int):
+        """Place a shard's virtual nodes on the ring"""
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            bisect.insort(self._keys, point)
+            self._nodes[point] = node
+
+    def get_node(self, key: str) -> int:
+        """Return the shard owning a key"""
+        if not self._keys:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._keys, self._hash(key.lower()))
+        return self._nodes[self._keys[index % len(self._keys)]]
+
+
+def _scrape_shard(
+    shard_id: int,
+    credentials: Dict[str, str],
+    subreddit_names: List[str],
+    months: int,
+    post_limit: int,
+    save_to_db: bool
+):
+    """
+    Worker entry point, runs in its own process
+
+    Builds a dedicated Reddit client and, if requested, a dedicated
+    database connection so shards never share sockets or rate limits.
+
+    Returns:
+        Tuple of (DataFrame of posts, shard stats dict)
+    """
+    # Imported here so each process sets up its own client state
+    from reddit import RedditScraper
+
+    logger = setup_logging(f'RedditScraper.shard{shard_id}')
+    started = time.monotonic()
+    stats = {
+        'shard': shard_id,
+        'client_id': credentials['client_id'],
+        'subreddits': len(subreddit_names),
+        'posts': 0,
+        'saved': False,
+        'error': None
+    }
+
+    try:
+        scraper = RedditScraper(logger=logger, credentials=credentials)
+        df = scraper.scrape_subreddit(
+            subreddit_names=subreddit_names,
+            months=months,
+            post_limit=post_limit
+        )
+        stats['posts'] = len(df)
+
+        if save_to_db and not df.empty:
+            from database import get_database_connection, save_scraped_data
+
+            db = get_database_connection()
+            if not db.connect():
+                stats['error'] = "Could not connect to the database"
+            else:
+                try:
+                    # Both backends print their own errors and return None
+                    if save_scraped_data(db, df) is None:
+                        stats['error'] = "Saving to the database failed"
+                    else:
+                        stats['saved'] = True
+                finally:
+                    db.disconnect()
+    except Exception as e:
+        logger.error(f"Shard {shard_id} failed: {e}")
+        stats['error'] = str(e)
+        df = pd.DataFrame()
+    finally:
+        # Worker processes exit without running atexit handlers
+        from http_cache import flush_open_stores
+        flush_open_stores()
+
+    stats['elapsed'] = time.monotonic() - started
+    return df, stats
+
+
+class ShardedScraper:
+    """Coordinator that fans subreddits out to worker processes"""
+
+    def __init__(self, credentials=None, workers: Optional[int] = None, logger=None):
+        """
+        Initialize the coordinator
+
+        Args:
+            credentials: List of credential dicts; defaults to
+                Settings.get_reddit_credentials()
+            workers: Number of shards/processes; defaults to
+                Settings.SHARD_WORKERS if set, otherwise one per
+                credential. Shards mostly wait on the API rate limit, so
+                the CPU count does not matter. Never more than the number
+                of credentials, since each OAuth app has its own rate
+                limit and shards must not share one.
+            logger: Optional logger instance
+        """
+        self.logger = logger or setup_logging()
+        self.credentials = credentials or Settings.get_reddit_credentials()
+        if not self.credentials:
+            raise ValueError(
+                "No Reddit API credentials configured. Set REDDIT_CLIENT_ID/"
+                "REDDIT_CLIENT_SECRET or REDDIT_CREDENTIALS."
+            )
+        requested = workers or Settings.SHARD_WORKERS or len(self.credentials)
+        if requested > len(self.credentials):
+            self.logger.warning(
+                f"Requested {requested} workers but only {len(self.credentials)} "
+                f"credentials are configured; using {len(self.credentials)} shards"
+            )
+        self.workers = min(requested, len(self.credentials))
+        self.ring = HashRing(list(range(self.workers)))
+
+    def assign_shards(self, subreddit_names: List[str]) -> Dict[int, List[str]]:
+        """Group subreddits by the shard that owns them"""
+        shards = {}
+        for name in subreddit_names:
+            shards.setdefault(self.ring.get_node(name), []).append(name)
+        return shards
+
+    def scrape(
+        self,
+        subreddit_names: Optional[List[str]] = None,
+        months: Optional[int] = 3,
+        post_limit: Optional[int] = None,
+        save_to_db: bool = False
+    ):
+        """
+        Scrape subreddits across all shards
+
+        Args:
+            subreddit_names: List of subreddit names
+            months: Number of months of historical data to retrieve
+            post_limit: Maximum number of posts per subreddit
+            save_to_db: Let each shard write its own posts to the database
+
+        Returns:
+            Tuple of (combined DataFrame, merged stats dict)
+        """
+        subreddit_names = subreddit_names or Settings.DEFAULT_SUBREDDITS
+        post_limit = post_limit or Settings.DEFAULT_POST_LIMIT
+        shards = self.assign_shards(subreddit_names)
+
+        started = time.monotonic()
+        frames = []
+        shard_stats = []
+
+        # One single-process pool per shard: a worker that dies breaks
+        # its own pool only, instead of failing every pending shard
+        with ExitStack() as stack:
+            futures = {
+                stack.enter_context(ProcessPoolExecutor(max_workers=1)).submit(
+                    _scrape_shard,
+                    shard_id,
+                    self.credentials[shard_id],
+                    names,
+                    months,
+                    post_limit,
+                    save_to_db
+                ): shard_id
+                for shard_id, names in shards.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    df, stats = future.result()
+                except Exception as e:
+                    # The worker process died (BrokenProcessPool)
+                    shard_id = futures[future]
+                    self.logger.error(f"Shard {shard_id} worker crashed: {e}")
+                    df = pd.DataFrame()
+                    stats = {
+                        'shard': shard_id,
+                        'client_id': self.credentials[shard_id]['client_id'],
+                        'subreddits': len(shards[shard_id]),
+                        'posts': 0,
+                        'saved': False,
+                        'error': str(e) or type(e).__name__,
+                        'elapsed': time.monotonic() - started
+                    }
+                frames.append(df)
+                shard_stats.append(stats)
+                self.logger.info(
+                    f"Shard {stats['shard']} collected {stats['posts']} posts "
+                    f"in {stats['elapsed']:.1f}s"
+                )
+
+        stats = self.merge_stats(shard_stats, time.monotonic() - started)
+        self.logger.info(
+            f"Collected {stats['posts']} posts from {stats['subreddits']} subreddits "
+            f"across {stats['shards']} shards ({stats['posts_per_minute']:.0f} posts/min)"
+        )
+
+        frames = [df for df in frames if not df.empty]
+        combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return combined, stats
+
+    @staticmethod
+    def merge_stats(shard_stats: List[dict], elapsed: float) -> dict:
+        """Combine per-shard stats into a run summary"""
+        posts = sum(s['posts'] for s in shard_stats)
+        return {
+            'shards': len(shard_stats),
+            'subreddits': sum(s['subreddits'] for s in shard_stats),
+            'posts': posts,
+            'failed_shards': [s['shard'] for s in shard_stats if s['error']],
+            'elapsed': elapsed,
+            'posts_per_minute': posts / elapsed * 60 if elapsed else 0.0,
+            'per_shard': sorted(shard_stats, key=lambda s: s['shard'])
+        }
+
+
+if __name__ == '__main__':
+    coordinator = ShardedScraper()
+
+    df, stats = coordinator.scrape(
+        subreddit_names=Settings.DEFAULT_SUBREDDITS,
+        post_limit=Settings.DEFAULT_POST_LIMIT
+    )
+
+    df.to_csv('reddit_posts.csv', index=False)
+    print(f"Saved {len(df)} posts to reddit_posts.csv")
+    print(f"Throughput: {stats['posts_per_minute']:.0f} posts/min over {stats['shards']} shards")
@@ -0,0 +1,309 @@
+import hashlib
+import heapq
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+URL_PATTERN = re.compile(r'https?://\S+')
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9']+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just let me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then
+there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours
+yourself yourselves i'm it's don't i've can't i'd you're that's what's
+""".split())
+
+
+def tokenize(text: str, ngrams: int = 2) -> List[str]:
+    """
+    Split text into lowercase terms
+
+    Args:
+        text: Raw title or body text
+        ngrams: Longest n-gram to emit, built from consecutive non-stopwords
+
+    Returns:
+        List of unigrams followed by higher-order n-grams
+    """
+    if not text:
+        return []
+
+    # Stopwords, short words and URLs break a run, so n-grams never
+    # join words that were not adjacent in the text
+    runs = [[]]
+    for chunk in URL_PATTERN.split(text.lower()):
+        for word in TOKEN_PATTERN.findall(chunk):
+            word = word.strip("'")
+            if len(word) > 1 and word not in STOPWORDS:
+                runs[-1].append(word)
+            elif runs[-1]:
+                runs.append([])
+        if runs[-1]:
+            runs.append([])
+
+    terms = [word for run in runs for word in run]
+    for n in range(2, ngrams + 1):
+        for run in runs:
+            terms.extend(' '.join(run[i:i + n]) for i in range(len(run) - n + 1))
+    return terms
+
+
+class CountMinSketch:
+    """Fixed-size approximate counter; estimates never undercount"""
+
+    def __init__(self, width: int = 512, depth: int = 4):
+        if not 1 <= depth <= 16:
+            raise ValueError("depth must be between 1 and 16")
+        self.width = width
+        self.depth = depth
+        self.rows = np.arange(depth)
+        # Per-bucket counts stay far below 2**31
+        self.table = np.zeros((depth, width), dtype=np.int32)
+
+    def indexes(self, term: str) -> List[int]:
+        """Column hit by the term in each row"""
+        # Each row takes its own 4-byte slice of one digest, so two terms
+        # that collide in one row are no more likely to collide in another
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * row:4 * row + 4], 'little') % self.width
+            for row in range(self.depth)
+        ]
+
+    def add_counts(self, counts: Dict[str, int]):
+        """Add a batch of term counts in one vectorised update"""
+        if not counts:
+            return
+        columns = np.array([self.indexes(term) for term in counts], dtype=np.int64).T
+        values = np.fromiter(counts.values(), dtype=np.int32, count=len(counts))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], values)
+
+    def estimate(self, term: str, table: Optional[np.ndarray] = None):
+        """Estimated count for a term, optionally against a merged table"""
+        table = self.table if table is None else table
+        return table[self.rows, self.indexes(term)].min().item()
+
+
+class TermBucket:
+    """Term counts for one subreddit over one time bucket"""
+
+    def __init__(self, width: int, depth: int, capacity: int):
+        self.sketch = CountMinSketch(width, depth)
+        self.capacity = capacity
+        self.top = {}
+        # Sketch columns of the top terms, reused by queries
+        self.columns = {}
+
+    def add_counts(self, counts: Dict[str, int]):
+        """Fold counts into the sketch and refresh the top-K candidates"""
+        self.sketch.add_counts(counts)
+        columns = dict(self.columns)
+        for term in counts:
+            if term not in columns:
+                columns[term] = self.sketch.indexes(term)
+
+        terms = list(columns)
+        estimates = self.sketch.table[
+            self.sketch.rows, np.array([columns[term] for term in terms])
+        ].min(axis=1)
+        self.top = dict(heapq.nlargest(
+            self.capacity, zip(terms, estimates.tolist()), key=lambda item: item[1]
+        ))
+        self.columns = {term: columns[term] for term in self.top}
+
+
+class TrendIndex:
+    """
+    Incremental per-subreddit term index
+
+    Each batch of posts is tokenized once; counts land in a count-min
+    sketch per (subreddit, time bucket) together with a bounded set of
+    heavy-hitter candidates. Buckets older than the retention window are
+    dropped, and queries only merge the small per-bucket sketches.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 3600,
+        retention_buckets: int = 24 * 7,
+        top_k: int = 50,
+        width: int = 512,
+        depth: int = 4,
+        half_life: Optional[timedelta] = None,
+        ngrams: int = 2
+    ):
+        """
+        Initialize the index
+
+        Args:
+            bucket_seconds: Width of each time bucket
+            retention_buckets: Buckets kept per subreddit before eviction
+            top_k: Heavy-hitter candidates tracked per bucket
+            width: Count-min sketch columns; each bucket holds a
+                depth x width int32 table (8 KiB at the defaults)
+            depth: Count-min sketch rows
+            half_life: Optional decay applied to older buckets at query time
+            ngrams: Longest n-gram indexed
+        """
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self.ngrams = ngrams
+        self.buckets: Dict[str, Dict[int, TermBucket]] = {}
+
+    def _bucket_start(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def _cutoff(self, now: Optional[datetime]) -> int:
+        """Start of the oldest bucket still inside the retention window"""
+        if now is None:
+            timestamp = time.time()
+        else:
+            timestamp = (now if now.tzinfo else now.replace(tzinfo=timezone.utc)).timestamp()
+        return self._bucket_start(timestamp) - (self.retention_buckets - 1) * self.bucket_seconds
+
+    def add_posts(self, df: pd.DataFrame, now: Optional[datetime] = None):
+        """
+        Index a batch of scraped posts
+
+        Args:
+            df: DataFrame with subreddit, created_utc, title and text columns
+            now: Reference time for retention; defaults to the wall clock
+        """
+        if df.empty:
+            return
+
+        cutoff = self._cutoff(now)
+        epoch = pd.Timestamp(0, tz='UTC')
+        created = (pd.to_datetime(df['created_utc'], utc=True) - epoch) // pd.Timedelta(seconds=1)
+
+        batch = {}
+        for subreddit, timestamp, title, text in zip(
+            df['subreddit'], created, df['title'].fillna(''), df['text'].fillna('')
+        ):
+            start = self._bucket_start(timestamp)
+            if start < cutoff:
+                continue
+            counts = batch.setdefault((subreddit.lower(), start), Counter())
+            # Title and body are tokenized separately so n-grams don't span them
+            counts.update(tokenize(title, self.ngrams))
+            counts.update(tokenize(text, self.ngrams))
+
+        for (subreddit, start), counts in batch.items():
+            buckets = self.buckets.setdefault(subreddit, {})
+            if start not in buckets:
+                buckets[start] = TermBucket(self.width, self.depth, self.top_k * 2)
+            buckets[start].add_counts(counts)
+
+        self.evict(now)
+
+    def evict(self, now: Optional[datetime] = None):
+        """
+        Drop buckets that have fallen out of the retention window
+
+        Runs across every subreddit, so idle ones are released too.
+        Subreddits left with no buckets are removed.
+
+        Args:
+            now: Reference time; defaults to the wall clock
+        """
+        cutoff = self._cutoff(now)
+        for subreddit in list(self.buckets):
+            buckets = self.buckets[subreddit]
+            for start in [start for start in buckets if start < cutoff]:
+                del buckets[start]
+            if not buckets:
+                del self.buckets[subreddit]
+
+    def top_terms(
+        self,
+        subreddit: str,
+        window: timedelta = timedelta(hours=24),
+        k: int = 10,
+        now: Optional[datetime] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Most frequent terms for a subreddit over a trailing window
+
+        Args:
+            subreddit: Subreddit name
+            window: Length of the trailing window
+            k: Number of terms to return
+            now: End of the window; defaults to the newest indexed bucket
+
+        Returns:
+            List of (term, estimated count) tuples, highest first
+        """
+        buckets = self.buckets.get(subreddit.lower())
+        if not buckets:
+            return []
+
+        if now is None:
+            end = max(buckets) + self.bucket_seconds
+        else:
+            end = (now if now.tzinfo else now.replace(tzinfo=timezone.utc)).timestamp()
+        start = end - window.total_seconds()
+        selected = [
+            (bucket_start, bucket) for bucket_start, bucket in buckets.items()
+            if start < bucket_start + self.bucket_seconds and bucket_start < end
+        ]
+        if not selected:
+            return []
+
+        weights = np.array([self._weight(end - bucket_start) for bucket_start, _ in selected])
+        tables = np.stack([bucket.sketch.table for _, bucket in selected])
+        merged = np.tensordot(weights, tables, axes=1)
+        candidates = {}
+        for _, bucket in selected:
+            candidates.update(bucket.columns)
+
+        terms = list(candidates)
+        columns = np.array([candidates[term] for term in terms], dtype=np.int64)
+        estimates = merged[np.arange(self.depth), columns].min(axis=1)
+        return heapq.nlargest(
+            k,
+            ((term, round(count)) for term, count in zip(terms, estimates.tolist())),
+            key=lambda item: item[1]
+        )
+
+    def _weight(self, age_seconds: float) -> float:
+        if self.half_life is None:
+            return 1.0
+        return 0.5 ** (age_seconds / self.half_life.total_seconds())
+
+    def subreddits(self) -> Iterable[str]:
+        """Subreddits with at least one indexed bucket"""
+        return self.buckets.keys()
+
+
+if __name__ == '__main__':
+    from reddit import RedditScraper
+    from settings import Settings
+
+    index = TrendIndex()
+    scraper = RedditScraper(trend_index=index)
+    scraper.scrape_subreddit(
+        subreddit_names=Settings.DEFAULT_SUBREDDITS,
+        post_limit=Settings.DEFAULT_POST_LIMIT
+    )
+
+    for name in index.subreddits():
+        started = time.perf_counter()
+        terms = index.top_terms(name, window=timedelta(days=7))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"r/{name} ({elapsed_ms:.1f} ms): {terms}")
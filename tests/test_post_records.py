@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import pytest
+
+from post_records import PostColumns
+
+
+def make_post(i, **overrides):
+    fields = dict(
+        id=f't{i}', author=f'user{i}', title=f'Post {i}', selftext='',
+        permalink=f'/r/python/comments/t{i}/post/', created_utc=1.7e9 + i,
+        score=i, num_comments=i
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_bad_post_leaves_columns_aligned():
+    records = PostColumns()
+    records.append(make_post(0), 'python')
+    with pytest.raises(TypeError):
+        records.append(make_post(1, score=None), 'python')
+    records.append(make_post(2), 'python')
+
+    df = records.to_dataframe()
+    assert df['id'].tolist() == ['t0', 't2']
+    assert df['score'].tolist() == [0, 2]
+
+
+def test_append_after_to_dataframe_raises():
+    records = PostColumns()
+    records.append(make_post(0), 'python')
+    records.to_dataframe()
+    with pytest.raises(RuntimeError):
+        records.append(make_post(1), 'python')
@@ -0,0 +1,56 @@
+import os
+import time
+
+import pandas as pd
+
+import sharded_scraper
+from sharded_scraper import ShardedScraper
+
+CREDENTIALS = [
+    {'client_id': f'app{i}', 'client_secret': 'secret', 'user_agent': 'test:sharding:v1'}
+    for i in range(3)
+]
+
+
+def fake_shard(shard_id, credentials, subreddit_names, months, post_limit, save_to_db):
+    """Stand-in for _scrape_shard; shard 0's process dies mid-run"""
+    if shard_id == 0:
+        os._exit(1)
+    time.sleep(1)
+    df = pd.DataFrame({'id': [f't{shard_id}'], 'subreddit': [subreddit_names[0]]})
+    stats = {
+        'shard': shard_id,
+        'client_id': credentials['client_id'],
+        'subreddits': len(subreddit_names),
+        'posts': len(df),
+        'saved': False,
+        'error': None,
+        'elapsed': 1.0
+    }
+    return df, stats
+
+
+def one_subreddit_per_shard(coordinator):
+    names = {}
+    i = 0
+    while len(names) < coordinator.workers:
+        names.setdefault(coordinator.ring.get_node(f'sub{i}'), f'sub{i}')
+        i += 1
+    return list(names.values())
+
+
+def test_defaults_to_one_shard_per_credential():
+    assert ShardedScraper(credentials=CREDENTIALS).workers == 3
+    assert ShardedScraper(credentials=CREDENTIALS, workers=2).workers == 2
+    assert ShardedScraper(credentials=CREDENTIALS, workers=8).workers == 3
+
+
+def test_crashed_worker_only_fails_its_own_shard(monkeypatch):
+    monkeypatch.setattr(sharded_scraper, '_scrape_shard', fake_shard)
+    coordinator = ShardedScraper(credentials=CREDENTIALS)
+
+    df, stats = coordinator.scrape(subreddit_names=one_subreddit_per_shard(coordinator))
+
+    assert stats['failed_shards'] == [0]
+    assert stats['posts'] == 2
+    assert sorted(df['id']) == ['t1', 't2']
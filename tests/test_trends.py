@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from trends import TrendIndex, tokenize
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+NOW = BASE + timedelta(hours=5)
+
+
+def hourly_posts(subreddit='python', hours=5):
+    return pd.DataFrame({
+        'subreddit': [subreddit] * hours,
+        'created_utc': [BASE + timedelta(hours=h, minutes=30) for h in range(hours)],
+        'title': ['asyncio'] * hours,
+        'text': [''] * hours,
+    })
+
+
+def test_window_boundaries():
+    index = TrendIndex()
+    index.add_posts(hourly_posts(), now=NOW)
+
+    assert index.top_terms('python', window=timedelta(hours=1), now=NOW) == [('asyncio', 1)]
+    assert index.top_terms('python', window=timedelta(hours=2), now=NOW) == [('asyncio', 2)]
+    assert index.top_terms('python', window=timedelta(hours=5), now=NOW) == [('asyncio', 5)]
+    assert index.top_terms('python', window=timedelta(hours=1)) == [('asyncio', 1)]
+
+
+def test_ngrams_do_not_cross_stopwords_or_fields():
+    assert 'python hate' not in tokenize('love the python and hate')
+    assert 'love python' not in tokenize('love the python')
+    assert 'async io' in tokenize('async io')
+
+    index = TrendIndex()
+    index.add_posts(pd.DataFrame({
+        'subreddit': ['python'],
+        'created_utc': [BASE],
+        'title': ['release notes'],
+        'text': ['asyncio changes'],
+    }), now=BASE)
+    terms = dict(index.top_terms('python', k=10, now=BASE + timedelta(hours=1)))
+    assert 'notes asyncio' not in terms
+    assert terms['release notes'] == 1
+
+
+def test_evict_drops_idle_subreddits():
+    index = TrendIndex(retention_buckets=24)
+    index.add_posts(hourly_posts('idle'), now=NOW)
+
+    later = BASE + timedelta(days=2)
+    busy = hourly_posts('busy')
+    busy['created_utc'] = later
+    index.add_posts(busy, now=later)
+
+    assert list(index.subreddits()) == ['busy']
+
+
+def test_singletons_never_rank_as_heavy_hitters():
+    rng = random.Random(0)
+    words = [f'word{rank}' for rank in range(1, 1001)]
+    weights = [1 / rank for rank in range(1, 1001)]
+    titles = [' '.join(rng.choices(words, weights, k=2)) for _ in range(20000)]
+    # Seen once; shares a sketch cell with 'word1' in the first row
+    titles.append('word11 word947')
+    true_counts = Counter(term for title in titles for term in tokenize(title))
+
+    index = TrendIndex()
+    index.add_posts(pd.DataFrame({
+        'subreddit': ['python'] * len(titles),
+        'created_utc': [BASE] * len(titles),
+        'title': titles,
+        'text': [''] * len(titles),
+    }), now=BASE)
+
+    top = index.top_terms('python', k=10, now=BASE + timedelta(hours=1))
+    assert top[0][0] == 'word1'
+    assert all(true_counts[term] > 1 for term, _ in top)
+    assert 'word11 word947' not in dict(top)